@@ -15,13 +15,31 @@ bl_info = {
 }
 
 import bpy
+from bpy.app.handlers import persistent
+import numpy as np
 import os
 import json
+import hashlib
+import gzip
+import collections
+import itertools
+import mimetypes
 import time
+import queue
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util import make_headers
 import tempfile
 import base64
-from datetime import datetime
+
+# orjson decodes large vertex/face arrays several times faster than json
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 from bpy.props import (
     StringProperty,
     IntProperty,
@@ -42,8 +60,53 @@ from bpy.types import (
 # Constants
 MAX_PROMPT_LENGTH = 500
 MAX_HISTORY_ITEMS = 5
+MAX_LOG_ENTRIES = 100
+LOG_LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+GZIP_MIN_BYTES = 4 * 1024
 DEFAULT_API_URL = "https://api.example.com/v1/"
 
+# File suffixes for formats that are downloaded and handed to Blender's importers
+MESH_FILE_SUFFIXES = {
+    'obj': ".obj",
+    'gltf': ".glb",
+}
+
+# Log entries are buffered here and copied into the WindowManager collection
+# in one batch, rather than one RNA write (and remove(0)) per message.
+# Worker threads log straight into the buffer. Taking a sequence number and
+# appending happen under _LOG_LOCK so entries land in sequence order, otherwise
+# a flush could pass an entry whose append was still pending.
+_LOG_BUFFER = collections.deque(maxlen=MAX_LOG_ENTRIES)
+_LOG_SEQUENCE = itertools.count()
+_LOG_LOCK = threading.Lock()
+_log_synced_sequence = -1
+
+# Names of objects tagged "cursorai_generated", so clearing them doesn't
+# have to scan every object in the file. The index can't see renames or
+# duplicates (which copy the tag), so it is only trusted while every name
+# still resolves and the file's object count matches the last sync.
+_GENERATED_NAMES = set()
+_generated_names_object_count = -1
+
+# Last formatted timestamp per format string, as (epoch second, text)
+_TIMESTAMP_CACHE = {}
+
+# On-disk cache of raw API responses, pruned oldest-first above the size limit
+_CACHE_DIR = os.path.join(bpy.utils.user_resource('CONFIG'), "cursorai_cache")
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# Shared HTTP session so keep-alive connections are reused across retries
+# and successive generations
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "User-Agent": "CursorAIMesh/1.0",
+    # gzip/deflate, plus br when a brotli decoder is installed
+    "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+})
+for _prefix in ("https://", "http://"):
+    _SESSION.mount(_prefix, HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+_session_retry_config = None
+
 # Helper functions
 def get_api_key(context):
     """Get API key from preferences or environment variable"""
@@ -60,22 +123,73 @@ def get_api_base_url(context):
     preferences = context.preferences.addons[__name__].preferences
     return preferences.api_base_url
 
-def add_log_entry(context, level, message):
-    """Add an entry to the log"""
-    logs = context.window_manager.cursorai_logs
+def format_timestamp(fmt):
+    """Format the current local time, reusing the result within the same second"""
+    now = int(time.time())
+    cached = _TIMESTAMP_CACHE.get(fmt)
+    if cached is None or cached[0] != now:
+        # Replace the whole tuple so concurrent readers never see a mixed entry
+        cached = (now, time.strftime(fmt, time.localtime(now)))
+        _TIMESTAMP_CACHE[fmt] = cached
+    return cached[1]
+
+def buffer_log_entry(threshold, level, fmt, *args):
+    """Queue a log entry without touching bpy, safe to call from any thread.
+    
+    The message is only formatted (fmt % args) if level passes threshold.
+    Returns whether the entry was kept.
+    """
+    if LOG_LEVELS[level] < LOG_LEVELS[threshold]:
+        return False
+    
+    message = fmt % args if args else fmt
+    timestamp = format_timestamp("%H:%M:%S")
+    with _LOG_LOCK:
+        _LOG_BUFFER.append((next(_LOG_SEQUENCE), timestamp, level, message))
+    return True
+
+def flush_log_buffer(window_manager):
+    """Copy buffered log entries into the logs collection in a single pass"""
+    global _log_synced_sequence
     
-    # Remove oldest log if we've reached the limit
-    if len(logs) >= 100:
-        logs.remove(0)
+    with _LOG_LOCK:
+        entries = list(_LOG_BUFFER)
+    pending = [entry for entry in entries if entry[0] > _log_synced_sequence]
+    if not pending:
+        return
     
-    # Add new log entry
-    new_log = logs.add()
-    new_log.level = level
-    new_log.message = message
-    new_log.timestamp = datetime.now().strftime("%H:%M:%S")
+    logs = window_manager.cursorai_logs
     
-    # Update the index to point to the new log
-    context.window_manager.cursorai_log_index = len(logs) - 1
+    # Rebuild from the buffer once instead of removing the oldest entries one by one
+    if len(logs) + len(pending) > MAX_LOG_ENTRIES:
+        logs.clear()
+        pending = entries
+    
+    for _, timestamp, level, message in pending:
+        new_log = logs.add()
+        new_log.level = level
+        new_log.message = message
+        new_log.timestamp = timestamp
+        new_log.display_text = f"[{timestamp}] {message}"
+    
+    _log_synced_sequence = pending[-1][0]
+    
+    # Update the index to point to the newest log
+    window_manager.cursorai_log_index = len(logs) - 1
+
+def flush_log_timer():
+    """One-shot timer that flushes the log buffer"""
+    flush_log_buffer(bpy.context.window_manager)
+    return None
+
+def add_log_entry(context, level, fmt, *args):
+    """Add an entry to the log, formatting fmt % args only if it passes the log level"""
+    if not buffer_log_entry(context.scene.cursorai_props.log_level, level, fmt, *args):
+        return
+    
+    # Flush once after the current burst of messages
+    if not bpy.app.timers.is_registered(flush_log_timer):
+        bpy.app.timers.register(flush_log_timer, first_interval=0.0)
 
 def add_history_item(context, item_type, prompt, image_path, resolution, format):
     """Add an item to the generation history"""
@@ -92,11 +206,66 @@ def add_history_item(context, item_type, prompt, image_path, resolution, format)
     new_item.image_path = image_path
     new_item.resolution = resolution
     new_item.format = format
-    new_item.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    new_item.timestamp = format_timestamp("%Y-%m-%d %H:%M:%S")
+    
+    # Precompute the list label so the UI list only reads attributes on redraw
+    if item_type == "TEXT":
+        if prompt:
+            new_item.display_text = prompt[:25] + "..." if len(prompt) > 25 else prompt
+        else:
+            new_item.display_text = "[No prompt]"
+    else:  # IMAGE
+        new_item.display_text = os.path.basename(image_path) if image_path else "[No image]"
     
     # Update the index to point to the new item
     context.window_manager.cursorai_history_index = len(history) - 1
 
+def tag_generated(obj):
+    """Mark an object as generated by CursorAI"""
+    global _generated_names_object_count
+    
+    obj["cursorai_generated"] = True
+    _GENERATED_NAMES.add(obj.name)
+    _generated_names_object_count = len(bpy.data.objects)
+
+def rebuild_generated_names():
+    """Rescan the file for generated objects"""
+    global _generated_names_object_count
+    
+    _GENERATED_NAMES.clear()
+    _GENERATED_NAMES.update(obj.name for obj in bpy.data.objects if obj.get("cursorai_generated", False))
+    _generated_names_object_count = len(bpy.data.objects)
+
+def forget_generated_names():
+    """Empty the index after every generated object has been removed"""
+    global _generated_names_object_count
+    
+    _GENERATED_NAMES.clear()
+    _generated_names_object_count = len(bpy.data.objects)
+
+def find_generated_objects():
+    """Return all generated objects, using the name index when it is still in sync"""
+    if _generated_names_object_count == len(bpy.data.objects):
+        indexed = [bpy.data.objects.get(name) for name in _GENERATED_NAMES]
+        if indexed and all(obj is not None and obj.get("cursorai_generated", False) for obj in indexed):
+            return indexed
+    
+    # Renamed, duplicated or deleted objects: fall back to the full scan
+    rebuild_generated_names()
+    return [bpy.data.objects[name] for name in _GENERATED_NAMES]
+
+@persistent
+def rebuild_generated_names_handler(*args):
+    """Keep the generated object index in sync after file loads and undo"""
+    rebuild_generated_names()
+
+@persistent
+def reset_loading_state_handler(*args):
+    """Clear loading state saved mid-generation, no request survives a file load"""
+    for scene in bpy.data.scenes:
+        scene.cursorai_props.is_loading = False
+        scene.cursorai_props.status_message = ""
+
 def create_mesh_from_data(context, mesh_data, name_prefix="Generated"):
     """Create a mesh object from the API response data"""
     try:
@@ -110,48 +279,103 @@ def create_mesh_from_data(context, mesh_data, name_prefix="Generated"):
             add_log_entry(context, "ERROR", "API response missing vertices or faces data")
             return None
         
+        # Check every array's shape before creating anything, so a malformed
+        # payload can't leave a half-built object behind
+        vertices_arr = np.asarray(vertices, dtype=np.float32)
+        if vertices_arr.ndim != 2 or vertices_arr.shape[1] != 3:
+            add_log_entry(context, "ERROR", "API response vertices must be (x, y, z) triples")
+            return None
+        
+        normals_arr = None
+        if normals and len(normals) == len(vertices):
+            normals_arr = np.asarray(normals, dtype=np.float32)
+            if normals_arr.ndim != 2 or normals_arr.shape[1] != 3:
+                add_log_entry(context, "ERROR", "API response normals must be (x, y, z) triples")
+                return None
+        
+        uvs_arr = None
+        if uvs and len(uvs) == len(vertices):
+            uvs_arr = np.asarray(uvs, dtype=np.float32)
+            if uvs_arr.ndim != 2 or uvs_arr.shape[1] != 2:
+                add_log_entry(context, "WARNING", "Ignoring UVs: expected one (u, v) pair per vertex")
+                uvs_arr = None
+        
+        # Create mesh from vertices and faces by filling the mesh buffers directly,
+        # avoiding from_pydata's generic per-element path
+        face_count = len(faces)
+        face_sizes = np.fromiter((len(face) for face in faces), dtype=np.int32, count=face_count)
+        loop_count = int(face_sizes.sum())
+        
+        if face_sizes.min() == face_sizes.max():
+            # All faces have the same number of corners, numpy can convert them in one go
+            face_indices = np.asarray(faces, dtype=np.int32).reshape(-1)
+        else:
+            face_indices = np.fromiter(itertools.chain.from_iterable(faces), dtype=np.int32, count=loop_count)
+        
+        loop_starts = np.zeros(face_count, dtype=np.int32)
+        np.cumsum(face_sizes[:-1], dtype=np.int32, out=loop_starts[1:])
+        
+        # foreach_set does no bounds checking and validation is opt-in, so reject
+        # out-of-range indices before they reach Blender
+        if face_indices.min() < 0 or face_indices.max() >= len(vertices):
+            add_log_entry(context, "ERROR", "API response has face indices outside the vertex range")
+            return None
+        
         # Create new mesh
-        timestamp = datetime.now().strftime("%H%M%S")
+        timestamp = format_timestamp("%H%M%S")
         mesh_name = f"{name_prefix}_{timestamp}"
         mesh = bpy.data.meshes.new(mesh_name)
-        
-        # Create the object and link it to the scene
         obj = bpy.data.objects.new(mesh_name, mesh)
-        context.collection.objects.link(obj)
-        
-        # Create mesh from vertices and faces
-        mesh.from_pydata(vertices, [], faces)
-        
-        # Set normals if provided
-        if normals and len(normals) == len(vertices):
-            mesh.create_normals_split()
-            for i, normal in enumerate(normals):
-                for poly in mesh.polygons:
-                    for loop_idx in poly.loop_indices:
-                        loop = mesh.loops[loop_idx]
-                        if loop.vertex_index == i:
-                            loop.normal = normal
-            mesh.use_auto_smooth = True
-        
-        # Set UVs if provided
-        if uvs and len(uvs) == len(vertices):
-            uv_layer = mesh.uv_layers.new(name="UVMap")
-            for poly in mesh.polygons:
-                for loop_idx in range(poly.loop_start, poly.loop_start + poly.loop_total):
-                    vertex_idx = mesh.loops[loop_idx].vertex_index
-                    uv_layer.data[loop_idx].uv = (uvs[vertex_idx][0], uvs[vertex_idx][1])
         
-        # Update mesh
-        mesh.update()
-        mesh.validate()
+        try:
+            mesh.vertices.add(len(vertices))
+            mesh.vertices.foreach_set("co", vertices_arr.reshape(-1))
+            
+            mesh.loops.add(loop_count)
+            mesh.loops.foreach_set("vertex_index", face_indices)
+            
+            mesh.polygons.add(face_count)
+            mesh.polygons.foreach_set("loop_start", loop_starts)
+            mesh.polygons.foreach_set("loop_total", face_sizes)
+            
+            # Single topology update: custom normals need the edges in place, the
+            # UV and normal writes below don't require another pass
+            mesh.update(calc_edges=True, calc_edges_loose=False)
+            
+            # Set normals if provided
+            if normals_arr is not None:
+                # Custom split normals only take effect with auto smooth enabled
+                mesh.use_auto_smooth = True
+                mesh.normals_split_custom_set_from_vertices(normals_arr)
+            
+            # Set UVs if provided
+            if uvs_arr is not None:
+                # Gather per-loop UVs from the per-vertex array and write them in one call
+                loop_vertex_indices = np.empty(len(mesh.loops), dtype=np.int32)
+                mesh.loops.foreach_get("vertex_index", loop_vertex_indices)
+                uv_layer = mesh.uv_layers.new(name="UVMap")
+                uv_layer.data.foreach_set("uv", uvs_arr[loop_vertex_indices].reshape(-1))
+            
+            # Validation walks the whole mesh, so it is opt-in for untrusted APIs
+            preferences = context.preferences.addons[__name__].preferences
+            if preferences.validate_mesh:
+                mesh.validate(verbose=False)
+        except Exception:
+            # Don't leave a half-built, untagged object behind
+            bpy.data.objects.remove(obj)
+            bpy.data.meshes.remove(mesh)
+            raise
+        
+        # Link the object to the scene only once it is complete
+        context.collection.objects.link(obj)
         
         # Add CursorAI custom property for identification
-        obj["cursorai_generated"] = True
+        tag_generated(obj)
         
         return obj
         
     except Exception as e:
-        add_log_entry(context, "ERROR", f"Error creating mesh: {str(e)}")
+        add_log_entry(context, "ERROR", "Error creating mesh: %s", e)
         return None
 
 def focus_on_object(context, obj):
@@ -159,13 +383,256 @@ def focus_on_object(context, obj):
     if not obj:
         return
         
-    # Select and make active
-    bpy.ops.object.select_all(action='DESELECT')
+    # Select and make active without going through the operator system
+    for selected in list(context.view_layer.objects.selected):
+        selected.select_set(False)
     obj.select_set(True)
     context.view_layer.objects.active = obj
     
-    # Focus view on the object
-    bpy.ops.view3d.view_selected(use_all_regions=False)
+    # Focus view on the object, only possible from inside a 3D view
+    if context.area is not None and context.area.type == 'VIEW_3D':
+        bpy.ops.view3d.view_selected(use_all_regions=False)
+
+def configure_session(api_base_url, retry_count):
+    """Mount an adapter with retry/backoff for the API, reusing it while the settings are unchanged"""
+    global _session_retry_config
+    
+    if _session_retry_config == (api_base_url, retry_count):
+        return
+    
+    retry_options = dict(
+        total=retry_count,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True,
+        raise_on_status=False  # Hand back the last error response instead of raising
+    )
+    try:
+        retry = Retry(allowed_methods=frozenset(['POST']), **retry_options)
+    except TypeError:
+        # urllib3 < 1.26 bundled with older Blender versions
+        retry = Retry(method_whitelist=frozenset(['POST']), **retry_options)
+    
+    _SESSION.mount(api_base_url, HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    _session_retry_config = (api_base_url, retry_count)
+
+def import_mesh_file(context, filepath, mesh_format):
+    """Import a downloaded OBJ/glTF file and tag the new objects as generated"""
+    existing = set(bpy.data.objects)
+    
+    try:
+        if mesh_format == 'gltf':
+            bpy.ops.import_scene.gltf(filepath=filepath)
+        elif bpy.app.version >= (3, 2, 0):
+            bpy.ops.wm.obj_import(filepath=filepath)
+        else:
+            bpy.ops.import_scene.obj(filepath=filepath)
+    except Exception as e:
+        add_log_entry(context, "ERROR", "Error importing %s file: %s", mesh_format, e)
+        return None
+    finally:
+        os.remove(filepath)
+    
+    imported = [obj for obj in bpy.data.objects if obj not in existing]
+    if not imported:
+        add_log_entry(context, "ERROR", "No objects found in %s response", mesh_format)
+        return None
+    
+    # Add CursorAI custom property for identification
+    for obj in imported:
+        tag_generated(obj)
+    
+    # Prefer a mesh object as the one to focus on
+    meshes = [obj for obj in imported if obj.type == 'MESH']
+    return meshes[0] if meshes else imported[0]
+
+def get_cache_key(api_endpoint, mesh_format, request_kwargs):
+    """Hash everything that determines the API response, including uploaded files"""
+    hasher = hashlib.sha256()
+    hasher.update(api_endpoint.encode())
+    hasher.update(mesh_format.encode())
+    hasher.update(json.dumps(request_kwargs.get("json"), sort_keys=True).encode())
+    hasher.update(json.dumps(request_kwargs.get("data"), sort_keys=True).encode())
+    
+    for spec in request_kwargs.get("files", {}).values():
+        upload_file = spec[1]
+        upload_file.seek(0)
+        for chunk in iter(lambda: upload_file.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    
+    return hasher.hexdigest()
+
+def get_cache_path(cache_key, mesh_format):
+    """Get the cache file path for a response"""
+    return os.path.join(_CACHE_DIR, cache_key + MESH_FILE_SUFFIXES.get(mesh_format, ".json"))
+
+def read_cache(cache_path):
+    """Return a cached response body, or None on a miss"""
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            body = cache_file.read()
+    except OSError:
+        return None
+    
+    # Mark the entry as recently used
+    os.utime(cache_path)
+    return body
+
+def write_cache(cache_path, body):
+    """Atomically store a response body and prune the cache to its size limit"""
+    os.makedirs(_CACHE_DIR, exist_ok=True)
+    
+    tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as cache_file:
+        cache_file.write(body)
+    os.replace(tmp_path, cache_path)
+    
+    prune_cache()
+
+def prune_cache():
+    """Remove least recently used cache entries until the cache fits MAX_CACHE_BYTES"""
+    entries = []
+    for entry in os.scandir(_CACHE_DIR):
+        if entry.is_file() and not entry.name.endswith(".tmp"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= MAX_CACHE_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total_size -= size
+
+def decode_response_body(body, mesh_format):
+    """Turn a response body into (mesh_data, mesh_file) for the main thread"""
+    if mesh_format in MESH_FILE_SUFFIXES:
+        with tempfile.NamedTemporaryFile(suffix=MESH_FILE_SUFFIXES[mesh_format], delete=False) as mesh_fh:
+            mesh_fh.write(body)
+        return None, mesh_fh.name
+    
+    return _loads(body), None
+
+def compress_json_payload(headers, request_kwargs):
+    """Gzip JSON request bodies above GZIP_MIN_BYTES; returns (headers, request_kwargs) to send"""
+    payload = request_kwargs.get("json")
+    if payload is None:
+        return headers, request_kwargs
+    
+    body = json.dumps(payload).encode()
+    if len(body) < GZIP_MIN_BYTES:
+        return headers, request_kwargs
+    
+    request_kwargs = {key: value for key, value in request_kwargs.items() if key != "json"}
+    request_kwargs["data"] = gzip.compress(body)
+    headers = dict(headers, **{"Content-Encoding": "gzip"})
+    return headers, request_kwargs
+
+def request_mesh(result_queue, cancel_event, api_endpoint, headers, mesh_format, cache_policy, log_level, status_message, timeout, **request_kwargs):
+    """Post a generation request from a worker thread.
+    
+    Must not touch bpy: log lines go to the log buffer, status updates and
+    the final result are handed to the main thread through result_queue.
+    JSON responses are decoded here; OBJ/glTF bodies are written to a
+    temporary file for the main thread to import.
+    
+    cache_policy is 'auto' (use and store cached responses), 'refresh'
+    (always call the API but store the response) or 'bypass'.
+    
+    Unless the request is cancelled, exactly one "result" is always posted so
+    the modal operator never waits forever.
+    """
+    mesh_data = None
+    mesh_file = None
+    error_message = "Unknown error"
+    result_posted = False
+    
+    # File handles passed for upload are also read when hashing the cache key;
+    # rewind them before sending and close them once the worker is done
+    upload_files = [spec[1] for spec in request_kwargs.get("files", {}).values()]
+    
+    try:
+        cache_path = None
+        if cache_policy != 'bypass':
+            cache_path = get_cache_path(get_cache_key(api_endpoint, mesh_format, request_kwargs), mesh_format)
+        
+        if cache_policy == 'auto':
+            body = read_cache(cache_path)
+            if body is not None:
+                try:
+                    mesh_data, mesh_file = decode_response_body(body, mesh_format)
+                except ValueError:
+                    buffer_log_entry(log_level, "WARNING", "Ignoring unreadable cache entry")
+                else:
+                    buffer_log_entry(log_level, "INFO", "Loaded mesh from cache")
+                    result_queue.put(("result", mesh_data, mesh_file, error_message))
+                    result_posted = True
+                    return
+        
+        if cancel_event.is_set():
+            return
+        
+        # Update status message
+        result_queue.put(("status", status_message))
+        
+        try:
+            # Make the request, retries and backoff are handled by the session adapter
+            for upload_file in upload_files:
+                upload_file.seek(0)
+            
+            # Image uploads are already compressed, only JSON bodies are gzipped
+            send_headers, send_kwargs = compress_json_payload(headers, request_kwargs)
+            response = _SESSION.post(
+                api_endpoint,
+                headers=send_headers,
+                timeout=timeout,
+                **send_kwargs
+            )
+            
+            if response.status_code == 200:
+                mesh_data, mesh_file = decode_response_body(response.content, mesh_format)
+                buffer_log_entry(log_level, "INFO", "Received successful response from API")
+                
+                # Don't cache JSON bodies without geometry, they would be replayed on every call
+                has_geometry = mesh_file is not None or (
+                    isinstance(mesh_data, dict) and mesh_data.get("vertices") and mesh_data.get("faces")
+                )
+                if cache_path and has_geometry:
+                    try:
+                        write_cache(cache_path, response.content)
+                    except OSError as e:
+                        buffer_log_entry(log_level, "WARNING", "Could not write cache entry: %s", e)
+            else:
+                error_message = f"API returned status code {response.status_code}: {response.text}"
+                buffer_log_entry(log_level, "ERROR", error_message)
+        except requests.exceptions.RequestException as e:
+            error_message = f"Network error: {str(e)}"
+            buffer_log_entry(log_level, "ERROR", error_message)
+        except ValueError:
+            # json.JSONDecodeError and orjson.JSONDecodeError are both ValueErrors
+            error_message = "Invalid JSON response from API"
+            buffer_log_entry(log_level, "ERROR", error_message)
+        
+        if cancel_event.is_set():
+            if mesh_file:
+                os.remove(mesh_file)
+            return
+        
+        result_queue.put(("result", mesh_data, mesh_file, error_message))
+        result_posted = True
+    except Exception as e:
+        # Cache and tempfile I/O can fail outside the request error handling above
+        error_message = f"Unexpected error: {str(e)}"
+        buffer_log_entry(log_level, "ERROR", error_message)
+    finally:
+        for upload_file in upload_files:
+            upload_file.close()
+        
+        if not result_posted and not cancel_event.is_set():
+            result_queue.put(("result", None, None, error_message))
 
 def show_message_box(message, title="Message", icon='INFO'):
     """Show a message box with the given message"""
@@ -180,6 +647,7 @@ class CursorAILogItem(PropertyGroup):
     timestamp: StringProperty(name="Time")
     level: StringProperty(name="Level")
     message: StringProperty(name="Message")
+    display_text: StringProperty(name="Display Text")
 
 class CursorAIHistoryItem(PropertyGroup):
     """History item properties"""
@@ -189,17 +657,105 @@ class CursorAIHistoryItem(PropertyGroup):
     resolution: StringProperty(name="Resolution")
     format: StringProperty(name="Format")
     timestamp: StringProperty(name="Timestamp")
+    display_text: StringProperty(name="Display Text")
 
 # Operators
-class CURSORAI_OT_generate_from_text(Operator):
+class CursorAIRequestMixin:
+    """Shared modal plumbing for the generator operators.
+    
+    The HTTP request runs on a worker thread while a window-manager timer
+    drains its result queue, so the UI stays responsive and ESC cancels.
+    Only the main thread touches bpy data.
+    """
+    _timer = None
+    _queue = None
+    _cancel_event = None
+    
+    def execute(self, context):
+        return self.invoke(context, None)
+    
+    def request_in_progress(self, context):
+        """Check for a running generation, which a second one would clobber"""
+        if not context.scene.cursorai_props.is_loading:
+            return False
+        
+        add_log_entry(context, "WARNING", "A generation is already in progress")
+        show_message_box("A generation is already in progress. Press ESC to cancel it.", "Busy", 'ERROR')
+        return True
+    
+    def start_request(self, context, **request_kwargs):
+        """Start the worker thread and enter modal mode"""
+        self._queue = queue.Queue()
+        self._cancel_event = threading.Event()
+        
+        worker = threading.Thread(
+            target=request_mesh,
+            args=(self._queue, self._cancel_event),
+            kwargs=request_kwargs,
+            daemon=True
+        )
+        worker.start()
+        
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def end_request(self, context):
+        """Remove the timer and reset the loading state"""
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        
+        props = context.scene.cursorai_props
+        props.is_loading = False
+        props.status_message = ""
+    
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.cancel(context)
+            add_log_entry(context, "INFO", "Generation cancelled by user")
+            return {'CANCELLED'}
+        
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        
+        flush_log_buffer(context.window_manager)
+        
+        props = context.scene.cursorai_props
+        while True:
+            try:
+                message = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            kind = message[0]
+            if kind == "status":
+                # Setting the property notifies the UI, no explicit redraw needed
+                props.status_message = message[1]
+            elif kind == "result":
+                self.end_request(context)
+                return self.finish(context, message[1], message[2], message[3])
+        
+        return {'PASS_THROUGH'}
+    
+    def cancel(self, context):
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+        self.end_request(context)
+
+class CURSORAI_OT_generate_from_text(CursorAIRequestMixin, Operator):
     """Generate a 3D mesh from a text prompt"""
     bl_idname = "cursorai.generate_from_text"
     bl_label = "Generate from Text"
     bl_options = {'REGISTER', 'UNDO'}
     
-    def execute(self, context):
+    def invoke(self, context, event):
         props = context.scene.cursorai_props
         
+        if self.request_in_progress(context):
+            return {'CANCELLED'}
+        
         # Check if API key is set
         api_key = get_api_key(context)
         if not api_key:
@@ -216,6 +772,7 @@ class CURSORAI_OT_generate_from_text(Operator):
         # Get API base URL
         api_base_url = get_api_base_url(context)
         api_endpoint = f"{api_base_url}generate_mesh"
+        configure_session(api_base_url, props.retry_count)
         
         # Prepare request data
         headers = {
@@ -229,65 +786,41 @@ class CURSORAI_OT_generate_from_text(Operator):
             "format": props.format
         }
         
+        # Remember the settings used, the panel may change while we wait
+        self._prompt = props.text_prompt
+        self._resolution = props.resolution
+        self._format = props.format
+        
         # Log the request
-        add_log_entry(context, "INFO", f"Sending request to {api_endpoint} with resolution {props.resolution}")
+        add_log_entry(context, "INFO", "Sending request to %s with resolution %s", api_endpoint, props.resolution)
         
         # Set loading state
         props.is_loading = True
+        props.status_message = "Generating mesh..."
         
-        # Make API request with retry logic
-        mesh_data = None
-        error_message = "Unknown error"
-        
-        for attempt in range(props.retry_count + 1):
-            try:
-                # Update status message
-                if attempt > 0:
-                    props.status_message = f"Retry {attempt}/{props.retry_count}..."
-                else:
-                    props.status_message = "Generating mesh..."
-                
-                # Force UI update
-                context.area.tag_redraw()
-                
-                # Make the request
-                response = requests.post(
-                    api_endpoint,
-                    headers=headers,
-                    json=payload,
-                    timeout=60
-                )
-                
-                if response.status_code == 200:
-                    mesh_data = response.json()
-                    add_log_entry(context, "INFO", "Received successful response from API")
-                    break
-                else:
-                    error_message = f"API returned status code {response.status_code}: {response.text}"
-                    add_log_entry(context, "ERROR", error_message)
-            except requests.exceptions.RequestException as e:
-                error_message = f"Network error: {str(e)}"
-                add_log_entry(context, "ERROR", error_message)
-            except json.JSONDecodeError:
-                error_message = "Invalid JSON response from API"
-                add_log_entry(context, "ERROR", error_message)
-                
-            if attempt < props.retry_count:
-                # Wait before retrying
-                time.sleep(2)
-                add_log_entry(context, "INFO", f"Attempt {attempt+1} failed. Retrying...")
-            
-        # Reset loading state
-        props.is_loading = False
-        props.status_message = ""
-        
-        if not mesh_data:
-            add_log_entry(context, "ERROR", f"Failed to generate mesh: {error_message}")
+        return self.start_request(
+            context,
+            api_endpoint=api_endpoint,
+            headers=headers,
+            mesh_format=props.format,
+            cache_policy=props.cache_policy,
+            log_level=props.log_level,
+            status_message="Generating mesh...",
+            timeout=60,
+            json=payload
+        )
+    
+    def finish(self, context, mesh_data, mesh_file, error_message):
+        if not mesh_data and not mesh_file:
+            add_log_entry(context, "ERROR", "Failed to generate mesh: %s", error_message)
             show_message_box(f"Failed to generate mesh: {error_message}", "Error", 'ERROR')
             return {'CANCELLED'}
         
         # Create the mesh and add to scene
-        obj = create_mesh_from_data(context, mesh_data, f"Text_{props.text_prompt[:20]}")
+        if mesh_file:
+            obj = import_mesh_file(context, mesh_file, self._format)
+        else:
+            obj = create_mesh_from_data(context, mesh_data, f"Text_{self._prompt[:20]}")
         
         if not obj:
             show_message_box("Failed to create mesh from API response", "Error", 'ERROR')
@@ -300,29 +833,32 @@ class CURSORAI_OT_generate_from_text(Operator):
         add_history_item(
             context,
             "TEXT",
-            props.text_prompt,
+            self._prompt,
             "",
-            props.resolution,
-            props.format
+            self._resolution,
+            self._format
         )
         
         # Report success
-        vertex_count = len(mesh_data.get("vertices", []))
-        face_count = len(mesh_data.get("faces", []))
-        add_log_entry(context, "INFO", f"Created mesh with {vertex_count} vertices and {face_count} faces")
+        vertex_count = len(obj.data.vertices) if obj.type == 'MESH' else 0
+        face_count = len(obj.data.polygons) if obj.type == 'MESH' else 0
+        add_log_entry(context, "INFO", "Created mesh with %d vertices and %d faces", vertex_count, face_count)
         
         self.report({'INFO'}, f"Created mesh with {vertex_count} vertices and {face_count} faces")
         return {'FINISHED'}
 
-class CURSORAI_OT_generate_from_image(Operator):
+class CURSORAI_OT_generate_from_image(CursorAIRequestMixin, Operator):
     """Generate a 3D mesh from an image"""
     bl_idname = "cursorai.generate_from_image"
     bl_label = "Generate from Image"
     bl_options = {'REGISTER', 'UNDO'}
     
-    def execute(self, context):
+    def invoke(self, context, event):
         props = context.scene.cursorai_props
         
+        if self.request_in_progress(context):
+            return {'CANCELLED'}
+        
         # Check if API key is set
         api_key = get_api_key(context)
         if not api_key:
@@ -338,31 +874,33 @@ class CURSORAI_OT_generate_from_image(Operator):
         
         # Check if file exists
         if not os.path.exists(bpy.path.abspath(props.image_path)):
-            add_log_entry(context, "ERROR", f"Image file not found: {props.image_path}")
+            add_log_entry(context, "ERROR", "Image file not found: %s", props.image_path)
             show_message_box(f"Image file not found: {props.image_path}", "Error", 'ERROR')
             return {'CANCELLED'}
         
         # Get API base URL
         api_base_url = get_api_base_url(context)
         api_endpoint = f"{api_base_url}image_to_mesh"
+        configure_session(api_base_url, props.retry_count)
         
         # Prepare request data
         headers = {
             "Authorization": f"Bearer {api_key}",
         }
         
-        # Read the image file
+        # Open the image file, the worker reads it while uploading and closes it
+        image_path = bpy.path.abspath(props.image_path)
         try:
-            with open(bpy.path.abspath(props.image_path), 'rb') as img_file:
-                image_data = img_file.read()
+            img_file = open(image_path, 'rb')
         except Exception as e:
-            add_log_entry(context, "ERROR", f"Error reading image file: {str(e)}")
+            add_log_entry(context, "ERROR", "Error reading image file: %s", e)
             show_message_box(f"Error reading image file: {str(e)}", "Error", 'ERROR')
             return {'CANCELLED'}
         
         # Prepare multipart form data
+        mime_type = mimetypes.guess_type(image_path)[0] or "application/octet-stream"
         files = {
-            'image': (os.path.basename(props.image_path), image_data)
+            'image': (os.path.basename(props.image_path), img_file, mime_type)
         }
         
         form_data = {
@@ -374,67 +912,44 @@ class CURSORAI_OT_generate_from_image(Operator):
         if props.image_prompt and len(props.image_prompt.strip()) > 0:
             form_data['prompt'] = props.image_prompt
         
+        # Remember the settings used, the panel may change while we wait
+        self._prompt = props.image_prompt
+        self._image_path = props.image_path
+        self._resolution = props.resolution
+        self._format = props.format
+        
         # Log the request
-        add_log_entry(context, "INFO", f"Sending image to {api_endpoint} with resolution {props.resolution}")
+        add_log_entry(context, "INFO", "Sending image to %s with resolution %s", api_endpoint, props.resolution)
         
         # Set loading state
         props.is_loading = True
+        props.status_message = "Generating mesh from image..."
         
-        # Make API request with retry logic
-        mesh_data = None
-        error_message = "Unknown error"
-        
-        for attempt in range(props.retry_count + 1):
-            try:
-                # Update status message
-                if attempt > 0:
-                    props.status_message = f"Retry {attempt}/{props.retry_count}..."
-                else:
-                    props.status_message = "Generating mesh from image..."
-                
-                # Force UI update
-                context.area.tag_redraw()
-                
-                # Make the request
-                response = requests.post(
-                    api_endpoint,
-                    headers=headers,
-                    files=files,
-                    data=form_data,
-                    timeout=120  # Longer timeout for image processing
-                )
-                
-                if response.status_code == 200:
-                    mesh_data = response.json()
-                    add_log_entry(context, "INFO", "Received successful response from API")
-                    break
-                else:
-                    error_message = f"API returned status code {response.status_code}: {response.text}"
-                    add_log_entry(context, "ERROR", error_message)
-            except requests.exceptions.RequestException as e:
-                error_message = f"Network error: {str(e)}"
-                add_log_entry(context, "ERROR", error_message)
-            except json.JSONDecodeError:
-                error_message = "Invalid JSON response from API"
-                add_log_entry(context, "ERROR", error_message)
-                
-            if attempt < props.retry_count:
-                # Wait before retrying
-                time.sleep(2)
-                add_log_entry(context, "INFO", f"Attempt {attempt+1} failed. Retrying...")
-            
-        # Reset loading state
-        props.is_loading = False
-        props.status_message = ""
-        
-        if not mesh_data:
-            add_log_entry(context, "ERROR", f"Failed to generate mesh: {error_message}")
+        return self.start_request(
+            context,
+            api_endpoint=api_endpoint,
+            headers=headers,
+            mesh_format=props.format,
+            cache_policy=props.cache_policy,
+            log_level=props.log_level,
+            status_message="Generating mesh from image...",
+            timeout=120,  # Longer timeout for image processing
+            files=files,
+            data=form_data
+        )
+    
+    def finish(self, context, mesh_data, mesh_file, error_message):
+        if not mesh_data and not mesh_file:
+            add_log_entry(context, "ERROR", "Failed to generate mesh: %s", error_message)
             show_message_box(f"Failed to generate mesh: {error_message}", "Error", 'ERROR')
             return {'CANCELLED'}
         
         # Create the mesh and add to scene
-        image_name = os.path.splitext(os.path.basename(props.image_path))[0]
-        obj = create_mesh_from_data(context, mesh_data, f"Image_{image_name[:20]}")
+        if mesh_file:
+            obj = import_mesh_file(context, mesh_file, self._format)
+        else:
+            image_name = os.path.splitext(os.path.basename(self._image_path))[0]
+            obj = create_mesh_from_data(context, mesh_data, f"Image_{image_name[:20]}")
         
         if not obj:
             show_message_box("Failed to create mesh from API response", "Error", 'ERROR')
@@ -447,16 +962,16 @@ class CURSORAI_OT_generate_from_image(Operator):
         add_history_item(
             context,
             "IMAGE",
-            props.image_prompt,
-            props.image_path,
-            props.resolution,
-            props.format
+            self._prompt,
+            self._image_path,
+            self._resolution,
+            self._format
         )
         
         # Report success
-        vertex_count = len(mesh_data.get("vertices", []))
-        face_count = len(mesh_data.get("faces", []))
-        add_log_entry(context, "INFO", f"Created mesh with {vertex_count} vertices and {face_count} faces")
+        vertex_count = len(obj.data.vertices) if obj.type == 'MESH' else 0
+        face_count = len(obj.data.polygons) if obj.type == 'MESH' else 0
+        add_log_entry(context, "INFO", "Created mesh with %d vertices and %d faces", vertex_count, face_count)
         
         self.report({'INFO'}, f"Created mesh with {vertex_count} vertices and {face_count} faces")
         return {'FINISHED'}
@@ -468,24 +983,20 @@ class CURSORAI_OT_clear_generated(Operator):
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
-        # Find all objects with the CursorAI custom property
-        cursorai_objects = [obj for obj in bpy.data.objects if obj.get("cursorai_generated", False)]
+        cursorai_objects = find_generated_objects()
         
         if not cursorai_objects:
             add_log_entry(context, "INFO", "No CursorAI generated objects found in the scene")
             show_message_box("No CursorAI generated objects found in the scene", "Info", 'INFO')
             return {'CANCELLED'}
         
-        # Select all CursorAI objects
-        bpy.ops.object.select_all(action='DESELECT')
+        # Remove the objects directly rather than through select + delete operators
         for obj in cursorai_objects:
-            obj.select_set(True)
-        
-        # Delete selected objects
-        bpy.ops.object.delete()
+            bpy.data.objects.remove(obj, do_unlink=True)
+        forget_generated_names()
         
         # Log the action
-        add_log_entry(context, "INFO", f"Removed {len(cursorai_objects)} CursorAI generated objects from the scene")
+        add_log_entry(context, "INFO", "Removed %d CursorAI generated objects from the scene", len(cursorai_objects))
         
         self.report({'INFO'}, f"Removed {len(cursorai_objects)} objects")
         return {'FINISHED'}
@@ -523,7 +1034,7 @@ class CURSORAI_OT_use_history_item(Operator):
             # Switch to image tab
             context.scene.cursorai_active_tab = 1
         
-        add_log_entry(context, "INFO", f"Loaded settings from history item: {item.timestamp}")
+        add_log_entry(context, "INFO", "Loaded settings from history item: %s", item.timestamp)
         
         return {'FINISHED'}
 
@@ -535,6 +1046,8 @@ class CURSORAI_OT_clear_logs(Operator):
     
     def execute(self, context):
         # Clear all logs
+        with _LOG_LOCK:
+            _LOG_BUFFER.clear()
         context.window_manager.cursorai_logs.clear()
         context.window_manager.cursorai_log_index = -1
         
@@ -556,20 +1069,11 @@ class CURSORAI_UL_history(UIList):
             
             row.label(text="", icon=type_icon)
             
-            # Display different content based on type
-            if item.item_type == "TEXT":
-                if item.prompt:
-                    # Truncate long prompts
-                    prompt_display = item.prompt[:25] + "..." if len(item.prompt) > 25 else item.prompt
-                    row.label(text=f"{prompt_display}")
-                else:
-                    row.label(text="[No prompt]")
-            else:  # IMAGE
-                img_name = os.path.basename(item.image_path) if item.image_path else "[No image]"
-                row.label(text=f"{img_name}")
+            # Truncated prompt or image name, computed when the item was added
+            row.label(text=item.display_text)
             
             # Add timestamp
-            row.label(text=f"{item.timestamp}")
+            row.label(text=item.timestamp)
             
         elif self.layout_type in {'GRID'}:
             layout.alignment = 'CENTER'
@@ -590,8 +1094,7 @@ class CURSORAI_UL_logs(UIList):
             else:
                 level_icon = 'INFO'
             
-            row.label(text=f"[{item.timestamp}]", icon=level_icon)
-            row.label(text=f"{item.message}")
+            row.label(text=item.display_text, icon=level_icon)
             
         elif self.layout_type in {'GRID'}:
             layout.alignment = 'CENTER'
@@ -653,6 +1156,29 @@ class CursorAIProperties(PropertyGroup):
         max=5
     )
     
+    log_level: EnumProperty(
+        name="Log Level",
+        description="Minimum severity of messages shown in the logs panel",
+        items=[
+            ('DEBUG', "Debug", "Show all messages"),
+            ('INFO', "Info", "Show informational messages, warnings and errors"),
+            ('WARNING', "Warning", "Show warnings and errors"),
+            ('ERROR', "Error", "Show errors only"),
+        ],
+        default='INFO'
+    )
+    
+    cache_policy: EnumProperty(
+        name="Cache",
+        description="How previously generated responses are reused",
+        items=[
+            ('auto', "Auto", "Reuse a cached response for identical requests"),
+            ('refresh', "Refresh", "Always call the API and update the cache"),
+            ('bypass', "Bypass", "Neither read nor write the cache"),
+        ],
+        default='auto'
+    )
+    
     # State tracking
     is_loading: BoolProperty(
         name="Is Loading",
@@ -684,12 +1210,19 @@ class CURSORAI_preferences(AddonPreferences):
         default=DEFAULT_API_URL,
     )
     
+    validate_mesh: BoolProperty(
+        name="Validate imported mesh",
+        description="Check and repair the geometry returned by the API (slow on large meshes)",
+        default=False
+    )
+    
     def draw(self, context):
         layout = self.layout
         layout.label(text="CursorAI Mesh Settings:")
         
         layout.prop(self, "api_key")
         layout.prop(self, "api_base_url")
+        layout.prop(self, "validate_mesh")
         
         layout.separator()
         layout.label(text="Note: You can also set the API key as an environment variable:")
@@ -768,8 +1301,14 @@ class CURSORAI_PT_main_panel(Panel):
         row.label(text="Retries:")
         row.prop(props, "retry_count", text="")
         
-        # Generate button
-        layout.operator("cursorai.generate_from_text", icon='SHADERFX')
+        row = box.row()
+        row.label(text="Cache:")
+        row.prop(props, "cache_policy", text="")
+        
+        # Generate button, one generation runs at a time
+        row = layout.row()
+        row.enabled = not props.is_loading
+        row.operator("cursorai.generate_from_text", icon='SHADERFX')
     
     def draw_image_panel(self, context, layout):
         props = context.scene.cursorai_props
@@ -798,8 +1337,14 @@ class CURSORAI_PT_main_panel(Panel):
         row.label(text="Retries:")
         row.prop(props, "retry_count", text="")
         
-        # Generate button
-        layout.operator("cursorai.generate_from_image", icon='MOD_BUILD')
+        row = box.row()
+        row.label(text="Cache:")
+        row.prop(props, "cache_policy", text="")
+        
+        # Generate button, one generation runs at a time
+        row = layout.row()
+        row.enabled = not props.is_loading
+        row.operator("cursorai.generate_from_image", icon='MOD_BUILD')
 
 class CURSORAI_PT_logs_panel(Panel):
     """CursorAI Mesh logs panel"""
@@ -813,6 +1358,8 @@ class CURSORAI_PT_logs_panel(Panel):
     def draw(self, context):
         layout = self.layout
         
+        layout.prop(context.scene.cursorai_props, "log_level")
+        
         # Log list
         row = layout.row()
         row.template_list(
@@ -861,6 +1408,17 @@ def register():
     
     bpy.types.WindowManager.cursorai_history = CollectionProperty(type=CursorAIHistoryItem)
     bpy.types.WindowManager.cursorai_history_index = IntProperty(name="History Index")
+    
+    # Index generated objects from previously saved files
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(rebuild_generated_names_handler)
+    bpy.app.handlers.load_post.append(reset_loading_state_handler)
+    try:
+        rebuild_generated_names()
+    except AttributeError:
+        # bpy.data is not available yet while Blender is starting up,
+        # load_post indexes the startup file
+        pass
 
 def unregister():
     # Unregister properties
@@ -874,6 +1432,19 @@ def unregister():
     # Unregister classes
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
+    
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if rebuild_generated_names_handler in handlers:
+            handlers.remove(rebuild_generated_names_handler)
+    if reset_loading_state_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(reset_loading_state_handler)
+    _GENERATED_NAMES.clear()
+    
+    if bpy.app.timers.is_registered(flush_log_timer):
+        bpy.app.timers.unregister(flush_log_timer)
+    
+    # Release pooled connections
+    _SESSION.close()
 
 if __name__ == "__main__":
     register()
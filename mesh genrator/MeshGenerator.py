@@ -15,10 +15,543 @@ bl_info = {
 }
 
 import bpy
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
+from concurrent.futures import Future
+import threading
 import json
 import os
-from bpy.props import StringProperty, IntProperty, EnumProperty
+import hashlib
+import itertools
+import struct
+import time
+from bpy.props import StringProperty, IntProperty, EnumProperty, BoolProperty, PointerProperty
+
+# orjson decodes large vertex/face arrays several times faster than json
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# ijson stream-decodes large bodies as they arrive instead of buffering them
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Decoded API responses are memoized on disk, keyed by the request
+_cache_dir = os.path.join(bpy.utils.user_resource('CONFIG'), "meshgen_cache")
+
+
+def get_cache_path(prompt, resolution, format, api_endpoint):
+    """Get the cache file for a request"""
+    key = hashlib.sha256(f"{prompt}|{resolution}|{format}|{api_endpoint}".encode()).hexdigest()
+    return os.path.join(_cache_dir, key + ".json")
+
+
+def load_cache_entry(cache_path):
+    """Load a cache entry ({"payload", "etag", "expires"}), or return None on a miss"""
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            entry = _loads(cache_file.read())
+    except (OSError, ValueError):
+        return None
+    
+    # Entries written before conditional requests hold the bare payload
+    if "payload" not in entry:
+        entry = {"payload": entry}
+    return entry
+
+
+def save_cache_entry(cache_path, entry):
+    """Atomically write a cache entry"""
+    os.makedirs(_cache_dir, exist_ok=True)
+    tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as cache_file:
+        # Meshes decoded from glTF hold ndarrays rather than lists
+        json.dump(entry, cache_file, default=np.ndarray.tolist)
+    os.replace(tmp_path, cache_path)
+
+
+def is_cache_entry_fresh(entry):
+    """Check whether a cache entry can be used without asking the server"""
+    if entry.get("expires") is not None:
+        return time.time() < entry["expires"]
+    
+    # Without a max-age, only entries with no ETag to revalidate are trusted
+    return entry.get("etag") is None
+
+
+def get_max_age(response):
+    """Get the Cache-Control max-age of a response in seconds, or None"""
+    for directive in response.headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() == "max-age":
+            try:
+                return int(value.strip('"'))
+            except ValueError:
+                return None
+    return None
+
+
+# Resolution at which requests switch to binary glTF transport
+GLTF_MIN_RESOLUTION = 1024
+
+GLB_MAGIC = b"glTF"
+
+# glTF accessor componentType -> little-endian numpy dtype
+_GLTF_COMPONENT_TYPES = {
+    5121: "<u1",
+    5123: "<u2",
+    5125: "<u4",
+    5126: "<f4",
+}
+
+_GLTF_TYPE_WIDTHS = {"SCALAR": 1, "VEC2": 2, "VEC3": 3}
+
+
+def parse_glb(data):
+    """Decode the triangle primitives of a single-mesh binary glTF into numpy arrays.
+    
+    Returns a dict with the same keys as a JSON API response, with
+    positions and normals converted from glTF's Y-up to Blender's Z-up.
+    Node transforms are not applied; files with several meshes are rejected.
+    """
+    try:
+        magic, version, _length = struct.unpack_from("<4sII", data, 0)
+        if magic != GLB_MAGIC or version != 2:
+            raise ValueError("not a glTF 2.0 binary")
+        
+        json_length, json_type = struct.unpack_from("<I4s", data, 12)
+        if json_type != b"JSON":
+            raise ValueError("missing JSON chunk")
+        gltf = _loads(data[20:20 + json_length])
+        
+        binary = b""
+        bin_start = 20 + json_length
+        if bin_start + 8 <= len(data):
+            bin_length, bin_type = struct.unpack_from("<I4s", data, bin_start)
+            if bin_type == b"BIN\0":
+                binary = memoryview(data)[bin_start + 8:bin_start + 8 + bin_length]
+        
+        def read_accessor(index):
+            accessor = gltf["accessors"][index]
+            view = gltf["bufferViews"][accessor["bufferView"]]
+            dtype = np.dtype(_GLTF_COMPONENT_TYPES[accessor["componentType"]])
+            width = _GLTF_TYPE_WIDTHS[accessor["type"]]
+            count = accessor["count"]
+            offset = view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+            stride = view.get("byteStride", 0)
+            
+            if stride and stride != dtype.itemsize * width:
+                # Interleaved attributes: view with the stride, then compact
+                return np.ascontiguousarray(np.ndarray(
+                    (count, width), dtype=dtype, buffer=binary,
+                    offset=offset, strides=(stride, dtype.itemsize)
+                ))
+            return np.frombuffer(binary, dtype=dtype, count=count * width, offset=offset).reshape(count, width)
+        
+        # Separate meshes would need their node transforms applied to line up
+        if len(gltf["meshes"]) != 1:
+            raise ValueError(f"expected a single mesh, got {len(gltf['meshes'])}")
+        
+        # Primitives (one per material) share the mesh's space, so concatenate
+        # them with each primitive's indices offset past the earlier vertices
+        positions, faces, normals, uvs = [], [], [], []
+        vertex_offset = 0
+        for primitive in gltf["meshes"][0]["primitives"]:
+            if primitive.get("mode", 4) != 4:
+                raise ValueError("only triangle primitives are supported")
+            attributes = primitive["attributes"]
+            
+            primitive_positions = read_accessor(attributes["POSITION"])
+            if "indices" in primitive:
+                primitive_faces = read_accessor(primitive["indices"]).astype(np.int64).reshape(-1, 3)
+            else:
+                primitive_faces = np.arange(len(primitive_positions)).reshape(-1, 3)
+            
+            positions.append(primitive_positions)
+            faces.append(primitive_faces + vertex_offset)
+            normals.append(read_accessor(attributes["NORMAL"]) if "NORMAL" in attributes else None)
+            uvs.append(read_accessor(attributes["TEXCOORD_0"]) if "TEXCOORD_0" in attributes else None)
+            vertex_offset += len(primitive_positions)
+        
+        positions = np.concatenate(positions)
+        faces = np.concatenate(faces)
+        
+        # Attributes are only kept if every primitive provides them
+        normals = np.concatenate(normals) if all(n is not None for n in normals) else None
+        uvs = np.concatenate(uvs) if all(uv is not None for uv in uvs) else None
+    except (KeyError, IndexError, TypeError, struct.error) as e:
+        raise ValueError(f"malformed glTF binary: {e!r}")
+    
+    # glTF is Y-up with a top-left UV origin
+    mesh_data = {
+        "vertices": positions[:, [0, 2, 1]] * np.array([1, -1, 1], dtype=np.float32),
+        "faces": faces,
+    }
+    if normals is not None:
+        mesh_data["normals"] = normals[:, [0, 2, 1]] * np.array([1, -1, 1], dtype=np.float32)
+    if uvs is not None:
+        mesh_data["uvs"] = np.column_stack((uvs[:, 0], 1.0 - uvs[:, 1]))
+    return mesh_data
+
+
+# JSON bodies at least this large are stream-decoded when ijson is available
+STREAM_MIN_BYTES = 8 * 1024 * 1024
+
+# Top-level keys holding float arrays
+_FLOAT_ARRAY_KEYS = ("vertices", "normals", "uvs")
+
+
+def should_stream_request(payload):
+    """Check whether a request's response may be stream-decoded.
+    
+    Only JSON requests can use the ijson path; everything else is read in
+    one go, so it is not sent with stream=True.
+    """
+    return ijson is not None and payload["format"] == 'json'
+
+
+def should_stream_response(response):
+    """Check whether a streamed response is a JSON body worth decoding incrementally"""
+    if "json" not in response.headers.get("Content-Type", ""):
+        return False
+    
+    # Large bodies are usually chunked (no Content-Length) and gzipped bodies
+    # report the compressed size, so only a small plain length opts out
+    content_length = response.headers.get("Content-Length")
+    if content_length is None or response.headers.get("Content-Encoding"):
+        return True
+    return int(content_length) >= STREAM_MIN_BYTES
+
+
+def stream_decode_mesh(response):
+    """Decode a JSON mesh response straight off the socket with ijson.
+    
+    Each top-level array is converted to numpy as soon as it is parsed, so
+    neither the raw body nor the whole Python object graph is held at once.
+    """
+    response.raw.decode_content = True
+    mesh_data = {}
+    try:
+        for key, value in ijson.kvitems(response.raw, "", use_float=True):
+            if key in _FLOAT_ARRAY_KEYS:
+                value = np.asarray(value, dtype=np.float32)
+            elif key == "faces" and len({len(face) for face in value}) == 1:
+                value = np.asarray(value, dtype=np.int32)
+            mesh_data[key] = value
+    except ijson.JSONError as e:
+        raise ValueError(str(e))
+    finally:
+        response.close()
+    return mesh_data
+
+
+def has_mesh_data(mesh_data):
+    """Check that decoded mesh data contains both vertices and faces"""
+    if not isinstance(mesh_data, dict):
+        return False
+    vertices = mesh_data.get("vertices")
+    faces = mesh_data.get("faces")
+    return vertices is not None and len(vertices) > 0 and faces is not None and len(faces) > 0
+
+# Shared HTTP session so keep-alive connections are reused across retries
+# and successive generations
+_SESSION = requests.Session()
+for _prefix in ("https://", "http://"):
+    _SESSION.mount(_prefix, HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=0))
+
+# (api_endpoint, retry_count) the retrying adapter is currently mounted for
+_session_retry_config = None
+
+
+def configure_session(api_endpoint, retry_count):
+    """Mount an adapter with retry/backoff for the API, reusing it while the settings are unchanged"""
+    global _session_retry_config
+    
+    if _session_retry_config == (api_endpoint, retry_count):
+        return
+    
+    retry_options = dict(
+        total=retry_count,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True,
+        raise_on_status=False  # Hand back the last error response instead of raising
+    )
+    try:
+        retry = Retry(allowed_methods=frozenset(['POST']), **retry_options)
+    except TypeError:
+        # urllib3 < 1.26 bundled with older Blender versions
+        retry = Retry(method_whitelist=frozenset(['POST']), **retry_options)
+    
+    _SESSION.mount(api_endpoint, HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry))
+    _session_retry_config = (api_endpoint, retry_count)
+
+# Bounds how many API requests run at once
+_REQUEST_SLOTS = threading.BoundedSemaphore(4)
+
+
+def submit_request(fn, *args):
+    """Run fn on a daemon worker thread and return a Future for its result.
+    
+    Daemon threads keep network waits off the UI thread without blocking
+    Blender from quitting while a request is still in flight, which a
+    ThreadPoolExecutor's non-daemon workers would.
+    """
+    future = Future()
+    
+    def run():
+        with _REQUEST_SLOTS:
+            # Futures cancelled while waiting for a slot are skipped
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+    
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+API_KEY_MISSING_MESSAGE = "API key not set. Please set it in the add-on preferences or as MESHGEN_API_KEY environment variable."
+
+
+def get_request_headers(preferences):
+    """Build the API request headers, or return None if no API key is set"""
+    api_key = preferences.api_key or os.environ.get("MESHGEN_API_KEY")
+    if not api_key:
+        return None
+    
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+
+def split_prompts(text):
+    """Split a batch prompt string on newlines or semicolons"""
+    return [prompt.strip() for prompt in text.replace(";", "\n").splitlines() if prompt.strip()]
+
+
+def request_mesh(api_endpoint, headers, payload, cache_path, use_cache):
+    """Fetch mesh data from the API.
+    
+    Runs on a worker thread, so it must not touch bpy. Retries and backoff
+    are handled by the session adapter mounted in configure_session().
+    Returns a (mesh_data, error_message, warnings) tuple.
+    """
+    # Reuse the result of an identical earlier request if there is one
+    entry = load_cache_entry(cache_path) if use_cache else None
+    mesh_data = None
+    new_entry = None
+    response_format = "JSON"
+    error_message = "Unknown error"
+    warnings = []
+    
+    if entry is not None:
+        if is_cache_entry_fresh(entry):
+            return entry["payload"], error_message, warnings
+        
+        # Stale entry: let the server answer 304 if it has not changed
+        if entry.get("etag"):
+            headers = dict(headers, **{"If-None-Match": entry["etag"]})
+    
+    stream = should_stream_request(payload)
+    
+    try:
+        response = _SESSION.post(
+            api_endpoint,
+            headers=headers,
+            json=payload,
+            timeout=30,
+            stream=stream
+        )
+        
+        max_age = get_max_age(response)
+        expires = time.time() + max_age if max_age is not None else None
+        
+        # A matching ETag on a POST is answered with 412 Precondition Failed per
+        # RFC 9110, lenient servers send 304; either way the entry is current
+        if response.status_code in (304, 412) and "If-None-Match" in headers:
+            # No body to read, hand the streamed connection back
+            response.close()
+            mesh_data = entry["payload"]
+            if expires is not None:
+                new_entry = dict(entry, expires=expires)
+        elif response.status_code == 200:
+            if stream and should_stream_response(response):
+                mesh_data = stream_decode_mesh(response)
+            elif response.content[:4] == GLB_MAGIC:
+                response_format = "glTF"
+                mesh_data = parse_glb(response.content)
+            else:
+                # Servers that ignore the glTF request still answer with JSON
+                mesh_data = _loads(response.content)
+            
+            # Only cache usable meshes, a bad body would otherwise be replayed
+            if has_mesh_data(mesh_data):
+                new_entry = {
+                    "payload": mesh_data,
+                    "etag": response.headers.get("ETag"),
+                    "expires": expires
+                }
+        else:
+            error_message = f"API returned status code {response.status_code}: {response.text}"
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+        # Reading the raw stream raises urllib3 errors rather than requests ones
+        error_message = f"Network error: {str(e)}"
+    except ValueError as e:
+        # json.JSONDecodeError and orjson.JSONDecodeError are both ValueErrors
+        if response_format == "glTF":
+            error_message = f"Invalid glTF response from API: {str(e)}"
+        else:
+            error_message = "Invalid JSON response from API"
+    
+    if mesh_data and new_entry and use_cache:
+        try:
+            save_cache_entry(cache_path, new_entry)
+        except OSError as e:
+            warnings.append(f"Could not write cache entry: {str(e)}")
+    
+    return mesh_data, error_message, warnings
+
+
+def create_mesh_object(mesh_data, mesh_name, validate=False):
+    """Build a mesh object from decoded API data.
+    
+    Must run on the main thread since bpy.data is not thread-safe. The mesh
+    is only validated on request, as the arrays written here are consistent.
+    The object is not linked; pass it to link_objects().
+    """
+    vertices = mesh_data["vertices"]
+    faces = mesh_data["faces"]
+    normals = mesh_data.get("normals")
+    uvs = mesh_data.get("uvs")
+    
+    # Coerce to contiguous arrays once so everything below works on ndarrays
+    verts = np.asarray(vertices, dtype=np.float32)
+    if verts.ndim != 2 or verts.shape[1] != 3:
+        raise ValueError("vertices must be (x, y, z) triples")
+    
+    normals_arr = None
+    if normals is not None and len(normals):
+        normals_arr = np.asarray(normals, dtype=np.float32)
+        if normals_arr.ndim != 2 or normals_arr.shape[1] != 3:
+            raise ValueError("normals must be (x, y, z) triples")
+    
+    uv_arr = None
+    if uvs is not None and len(uvs):
+        uv_arr = np.asarray(uvs, dtype=np.float32)
+        if uv_arr.ndim != 2 or uv_arr.shape[1] != 2:
+            raise ValueError("uvs must be (u, v) pairs")
+    
+    # Create mesh from vertices and faces by pushing contiguous arrays straight
+    # into the mesh buffers instead of marshalling nested lists via from_pydata.
+    # foreach_set only takes the fast buffer path for C-contiguous arrays whose
+    # dtype matches the property, so every input goes through ascontiguousarray.
+    face_count = len(faces)
+    if isinstance(faces, np.ndarray):
+        # Faces decoded from glTF are already a (F, 3) array
+        face_sizes = np.full(face_count, faces.shape[1], dtype=np.int32)
+    else:
+        face_sizes = np.fromiter((len(face) for face in faces), dtype=np.int32, count=face_count)
+    loop_count = int(face_sizes.sum())
+    
+    if face_sizes.min() == face_sizes.max():
+        # Uniform tri/quad data converts in one go
+        face_indices = np.asarray(faces, dtype=np.int32).ravel()
+    else:
+        # Mixed face sizes
+        face_indices = np.fromiter(itertools.chain.from_iterable(faces), dtype=np.int32, count=loop_count)
+    
+    loop_starts = np.zeros(face_count, dtype=np.int32)
+    np.cumsum(face_sizes[:-1], dtype=np.int32, out=loop_starts[1:])
+    
+    # foreach_set does no bounds checking and validation is opt-in, so reject
+    # out-of-range indices before they reach Blender
+    if face_indices.min() < 0 or face_indices.max() >= verts.shape[0]:
+        raise ValueError("face indices outside the vertex range")
+    
+    # Create new mesh
+    mesh = bpy.data.meshes.new(mesh_name)
+    
+    # Create the object
+    obj = bpy.data.objects.new(mesh_name, mesh)
+    
+    mesh.vertices.add(verts.shape[0])
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(verts.ravel(), dtype=np.float32))
+    
+    mesh.loops.add(loop_count)
+    mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(face_indices, dtype=np.int32))
+    
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set("loop_start", np.ascontiguousarray(loop_starts, dtype=np.int32))
+    mesh.polygons.foreach_set("loop_total", np.ascontiguousarray(face_sizes, dtype=np.int32))
+    
+    mesh.update(calc_edges=True)
+    
+    # Vertex index of every loop, used to expand per-vertex UVs
+    loop_vertex_indices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertex_indices)
+    
+    # Set normals if provided
+    if normals_arr is not None and normals_arr.shape[0] == verts.shape[0]:
+        # Custom split normals only take effect with auto smooth enabled
+        mesh.use_auto_smooth = True
+        mesh.normals_split_custom_set_from_vertices(normals_arr)
+    
+    # Set UVs if provided
+    if uv_arr is not None and uv_arr.shape[0] == verts.shape[0]:
+        uv_layer = mesh.uv_layers.new(name="UVMap")
+        uv_layer.data.foreach_set("uv", np.ascontiguousarray(uv_arr[loop_vertex_indices].ravel(), dtype=np.float32))
+    
+    if validate:
+        mesh.validate()
+    
+    return obj
+
+
+def link_objects(context, objects):
+    """Link new objects into the active collection in one pass.
+    
+    Linking only tags the depsgraph, which is evaluated once on the next redraw.
+    """
+    collection = context.collection
+    for obj in objects:
+        collection.objects.link(obj)
+
+
+def frame_selected():
+    """Frame the selection in the first 3D viewport.
+    
+    Registered as a bpy.app.timers callback so the viewport redraw happens
+    after the operator has returned.
+    """
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type != 'VIEW_3D':
+                continue
+            region = next((region for region in area.regions if region.type == 'WINDOW'), None)
+            if region is None:
+                continue
+            
+            if hasattr(bpy.context, "temp_override"):
+                with bpy.context.temp_override(window=window, area=area, region=region):
+                    bpy.ops.view3d.view_selected(use_all_regions=False)
+            else:
+                # Context override dicts for Blender < 3.2
+                override = {'window': window, 'screen': window.screen, 'area': area, 'region': region}
+                bpy.ops.view3d.view_selected(override, use_all_regions=False)
+            return None
+    return None
+
 
 class MESHGEN_OT_generate_mesh(bpy.types.Operator):
     """Generate a mesh from a natural language prompt"""
@@ -62,119 +595,122 @@ class MESHGEN_OT_generate_mesh(bpy.types.Operator):
         max=5
     )
     
+    use_cache: BoolProperty(
+        name="Use Cache",
+        description="Reuse the stored result of an identical earlier request",
+        default=True
+    )
+    
+    validate: BoolProperty(
+        name="Validate Mesh",
+        description="Check the generated geometry for invalid data and correct it",
+        default=False
+    )
+    
+    frame_view: BoolProperty(
+        name="Frame View",
+        description="Frame the 3D viewport on the generated mesh",
+        default=True
+    )
+    
+    _timer = None
+    _future = None
+    
+    def invoke(self, context, event):
+        # Take settings the caller did not pass from the panel
+        props = context.scene.meshgen_props
+        for name in ("prompt", "resolution", "format", "retry_count"):
+            if not self.properties.is_property_set(name):
+                setattr(self, name, getattr(props, name))
+        return self.execute(context)
+    
     def execute(self, context):
         preferences = context.preferences.addons[__name__].preferences
         api_endpoint = preferences.api_endpoint
-        api_key = preferences.api_key
         
-        # Check if API key is set
-        if not api_key:
-            api_key = os.environ.get("MESHGEN_API_KEY")
-            if not api_key:
-                self.report({'ERROR'}, "API key not set. Please set it in the add-on preferences or as MESHGEN_API_KEY environment variable.")
-                return {'CANCELLED'}
+        headers = get_request_headers(preferences)
+        if headers is None:
+            self.report({'ERROR'}, API_KEY_MISSING_MESSAGE)
+            return {'CANCELLED'}
         
         # Check if prompt is provided
         if not self.prompt:
             self.report({'ERROR'}, "Please enter a prompt.")
             return {'CANCELLED'}
         
-        # Prepare request data
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
+        # Large meshes are far smaller as binary glTF than as JSON text
+        mesh_format = 'gltf' if int(self.resolution) >= GLTF_MIN_RESOLUTION else self.format
         
         payload = {
             "prompt": self.prompt,
             "resolution": int(self.resolution),
-            "format": self.format
+            "format": mesh_format
         }
         
-        # Make API request with retry logic
-        mesh_data = None
-        error_message = "Unknown error"
+        cache_path = get_cache_path(self.prompt, self.resolution, mesh_format, api_endpoint)
+        configure_session(api_endpoint, self.retry_count)
         
-        for attempt in range(self.retry_count + 1):
-            try:
-                response = requests.post(
-                    api_endpoint,
-                    headers=headers,
-                    json=payload,
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    mesh_data = response.json()
-                    break
-                else:
-                    error_message = f"API returned status code {response.status_code}: {response.text}"
-            except requests.exceptions.RequestException as e:
-                error_message = f"Network error: {str(e)}"
-            except json.JSONDecodeError:
-                error_message = "Invalid JSON response from API"
-                
-            if attempt < self.retry_count:
-                self.report({'WARNING'}, f"Attempt {attempt+1} failed. Retrying...")
-            
+        # Run the request on a worker thread so the UI stays responsive
+        self._future = submit_request(
+            request_mesh, api_endpoint, headers, payload, cache_path, self.use_cache
+        )
+        
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        self.report({'INFO'}, "Generating mesh...")
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            # The worker cannot be interrupted; its result is simply dropped
+            self._future.cancel()
+            self.cancel(context)
+            self.report({'WARNING'}, "Mesh generation cancelled")
+            return {'CANCELLED'}
+        
+        if event.type != 'TIMER' or not self._future.done():
+            return {'PASS_THROUGH'}
+        
+        self.cancel(context)
+        try:
+            mesh_data, error_message, warnings = self._future.result()
+        except Exception as e:
+            self.report({'ERROR'}, f"Failed to generate mesh: {str(e)}")
+            return {'CANCELLED'}
+        for warning in warnings:
+            self.report({'WARNING'}, warning)
+        return self.finish(context, mesh_data, error_message)
+    
+    def cancel(self, context):
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+    
+    def finish(self, context, mesh_data, error_message):
         if not mesh_data:
             self.report({'ERROR'}, f"Failed to generate mesh: {error_message}")
             return {'CANCELLED'}
         
         try:
-            # Extract mesh data
-            vertices = mesh_data.get("vertices")
-            faces = mesh_data.get("faces")
-            normals = mesh_data.get("normals")
-            uvs = mesh_data.get("uvs")
-            
-            if not vertices or not faces:
+            if not has_mesh_data(mesh_data):
                 self.report({'ERROR'}, "API response missing vertices or faces data")
                 return {'CANCELLED'}
             
-            # Create new mesh
-            mesh_name = f"Generated_{self.prompt[:20]}"
-            mesh = bpy.data.meshes.new(mesh_name)
-            
-            # Create the object and link it to the scene
-            obj = bpy.data.objects.new(mesh_name, mesh)
-            context.collection.objects.link(obj)
-            
-            # Create mesh from vertices and faces
-            mesh.from_pydata(vertices, [], faces)
-            
-            # Set normals if provided
-            if normals and len(normals) == len(vertices):
-                mesh.create_normals_split()
-                for i, normal in enumerate(normals):
-                    for poly in mesh.polygons:
-                        for loop_idx in poly.loop_indices:
-                            loop = mesh.loops[loop_idx]
-                            if loop.vertex_index == i:
-                                loop.normal = normal
-                mesh.use_auto_smooth = True
-            
-            # Set UVs if provided
-            if uvs and len(uvs) == len(vertices):
-                uv_layer = mesh.uv_layers.new(name="UVMap")
-                for poly in mesh.polygons:
-                    for loop_idx in range(poly.loop_start, poly.loop_start + poly.loop_total):
-                        vertex_idx = mesh.loops[loop_idx].vertex_index
-                        uv_layer.data[loop_idx].uv = (uvs[vertex_idx][0], uvs[vertex_idx][1])
-            
-            # Update mesh
-            mesh.update()
-            mesh.validate()
+            obj = create_mesh_object(mesh_data, f"Generated_{self.prompt[:20]}", self.validate)
+            link_objects(context, [obj])
             
             # Select and focus on the new object
-            bpy.ops.object.select_all(action='DESELECT')
+            for selected in list(context.view_layer.objects.selected):
+                selected.select_set(False)
             obj.select_set(True)
             context.view_layer.objects.active = obj
-            bpy.ops.view3d.view_selected(use_all_regions=False)
+            if self.frame_view:
+                bpy.app.timers.register(frame_selected, first_interval=0.0)
             
             # Report success
-            vertex_count = len(vertices)
-            face_count = len(faces)
+            vertex_count = len(obj.data.vertices)
+            face_count = len(obj.data.polygons)
             self.report({'INFO'}, f"Created mesh with {vertex_count} vertices and {face_count} faces")
             
             return {'FINISHED'}
@@ -184,6 +720,225 @@ class MESHGEN_OT_generate_mesh(bpy.types.Operator):
             return {'CANCELLED'}
 
 
+class MESHGEN_OT_batch_generate(bpy.types.Operator):
+    """Generate one mesh per prompt, running the requests concurrently"""
+    bl_idname = "meshgen.batch_generate"
+    bl_label = "Batch Generate"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    prompts: StringProperty(
+        name="Prompts",
+        description="Prompts to generate, separated by newlines or semicolons",
+        default=""
+    )
+    
+    resolution: EnumProperty(
+        name="Resolution",
+        description="Resolution of the generated meshes",
+        items=[
+            ('256', "256", "Low resolution"),
+            ('512', "512", "Medium resolution"),
+            ('1024', "1024", "High resolution"),
+        ],
+        default='512'
+    )
+    
+    format: EnumProperty(
+        name="Format",
+        description="Format of the mesh data",
+        items=[
+            ('json', "JSON", "JSON format"),
+            ('obj', "OBJ", "OBJ format"),
+            ('gltf', "glTF", "glTF format"),
+        ],
+        default='json'
+    )
+    
+    retry_count: IntProperty(
+        name="Retry Count",
+        description="Number of retries if API call fails",
+        default=1,
+        min=0,
+        max=5
+    )
+    
+    use_cache: BoolProperty(
+        name="Use Cache",
+        description="Reuse the stored result of an identical earlier request",
+        default=True
+    )
+    
+    validate: BoolProperty(
+        name="Validate Mesh",
+        description="Check the generated geometry for invalid data and correct it",
+        default=False
+    )
+    
+    frame_view: BoolProperty(
+        name="Frame View",
+        description="Frame the 3D viewport on the generated mesh",
+        default=True
+    )
+    
+    _timer = None
+    _pending = None
+    _created = None
+    _failed = 0
+    
+    def invoke(self, context, event):
+        # Take settings the caller did not pass from the panel
+        props = context.scene.meshgen_props
+        settings = (
+            ("prompts", "batch_prompts"),
+            ("resolution", "resolution"),
+            ("format", "format"),
+            ("retry_count", "retry_count"),
+        )
+        for name, panel_name in settings:
+            if not self.properties.is_property_set(name):
+                setattr(self, name, getattr(props, panel_name))
+        return self.execute(context)
+    
+    def execute(self, context):
+        preferences = context.preferences.addons[__name__].preferences
+        api_endpoint = preferences.api_endpoint
+        
+        headers = get_request_headers(preferences)
+        if headers is None:
+            self.report({'ERROR'}, API_KEY_MISSING_MESSAGE)
+            return {'CANCELLED'}
+        
+        prompts = split_prompts(self.prompts)
+        if not prompts:
+            self.report({'ERROR'}, "Please enter at least one prompt.")
+            return {'CANCELLED'}
+        
+        configure_session(api_endpoint, self.retry_count)
+        
+        # Submit every prompt up front; the request slots bound how many
+        # requests are in flight at once over the pooled session
+        mesh_format = 'gltf' if int(self.resolution) >= GLTF_MIN_RESOLUTION else self.format
+        self._pending = []
+        for prompt in prompts:
+            payload = {
+                "prompt": prompt,
+                "resolution": int(self.resolution),
+                "format": mesh_format
+            }
+            cache_path = get_cache_path(prompt, self.resolution, mesh_format, api_endpoint)
+            future = submit_request(
+                request_mesh, api_endpoint, headers, payload, cache_path, self.use_cache
+            )
+            self._pending.append((prompt, future))
+        
+        self._created = []
+        self._failed = 0
+        
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        self.report({'INFO'}, f"Generating {len(prompts)} meshes...")
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            # Requests that have not started yet are dropped, running ones are ignored
+            for _prompt, future in self._pending:
+                future.cancel()
+            self.cancel(context)
+            self.report({'WARNING'}, f"Batch cancelled after {len(self._created)} meshes")
+            if not self._created:
+                return {'CANCELLED'}
+            
+            link_objects(context, self._created)
+            return {'FINISHED'}
+        
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        
+        # Build meshes for finished requests one by one on the main thread
+        still_pending = []
+        for prompt, future in self._pending:
+            if future.done():
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Count the failure and keep draining the other requests
+                    self.report({'ERROR'}, f"Failed to generate mesh for '{prompt}': {str(e)}")
+                    self._failed += 1
+                    continue
+                self.build(context, prompt, *result)
+            else:
+                still_pending.append((prompt, future))
+        self._pending = still_pending
+        
+        if self._pending:
+            return {'PASS_THROUGH'}
+        
+        self.cancel(context)
+        return self.finish(context)
+    
+    def cancel(self, context):
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+    
+    def build(self, context, prompt, mesh_data, error_message, warnings):
+        for warning in warnings:
+            self.report({'WARNING'}, f"{prompt}: {warning}")
+        
+        if not mesh_data:
+            self.report({'ERROR'}, f"Failed to generate mesh for '{prompt}': {error_message}")
+            self._failed += 1
+            return
+        
+        if not has_mesh_data(mesh_data):
+            self.report({'ERROR'}, f"API response for '{prompt}' missing vertices or faces data")
+            self._failed += 1
+            return
+        
+        try:
+            self._created.append(create_mesh_object(mesh_data, f"Generated_{prompt[:20]}", self.validate))
+        except Exception as e:
+            self.report({'ERROR'}, f"Error creating mesh for '{prompt}': {str(e)}")
+            self._failed += 1
+    
+    def finish(self, context):
+        if not self._created:
+            self.report({'ERROR'}, "Failed to generate any meshes")
+            return {'CANCELLED'}
+        
+        # Link everything at once so the depsgraph is evaluated once
+        link_objects(context, self._created)
+        
+        # Select the new objects and focus on them
+        for selected in list(context.view_layer.objects.selected):
+            selected.select_set(False)
+        for obj in self._created:
+            obj.select_set(True)
+        context.view_layer.objects.active = self._created[-1]
+        if self.frame_view:
+            bpy.app.timers.register(frame_selected, first_interval=0.0)
+        
+        self.report({'INFO'}, f"Created {len(self._created)} meshes, {self._failed} failed")
+        return {'FINISHED'}
+
+
+class MESHGEN_OT_clear_cache(bpy.types.Operator):
+    """Delete all cached API responses"""
+    bl_idname = "meshgen.clear_cache"
+    bl_label = "Clear Cache"
+    bl_options = {'REGISTER'}
+    
+    def execute(self, context):
+        if os.path.isdir(_cache_dir):
+            for name in os.listdir(_cache_dir):
+                os.remove(os.path.join(_cache_dir, name))
+        
+        self.report({'INFO'}, "Mesh cache cleared")
+        return {'FINISHED'}
+
+
 class MESHGEN_PT_panel(bpy.types.Panel):
     """MeshGenerator UI Panel"""
     bl_label = "MeshGenerator"
@@ -194,12 +949,12 @@ class MESHGEN_PT_panel(bpy.types.Panel):
     
     def draw(self, context):
         layout = self.layout
-        scene = context.scene
+        props = context.scene.meshgen_props
         
         # Prompt input
         layout.label(text="Character Description:")
         row = layout.row()
-        row.prop(scene, "meshgen_prompt", text="")
+        row.prop(props, "prompt", text="")
         
         # Options
         box = layout.box()
@@ -207,23 +962,25 @@ class MESHGEN_PT_panel(bpy.types.Panel):
         
         row = box.row()
         row.label(text="Resolution:")
-        row.prop(scene, "meshgen_resolution", text="")
+        row.prop(props, "resolution", text="")
         
         row = box.row()
         row.label(text="Format:")
-        row.prop(scene, "meshgen_format", text="")
+        row.prop(props, "format", text="")
         
         row = box.row()
         row.label(text="Retries:")
-        row.prop(scene, "meshgen_retry_count", text="")
+        row.prop(props, "retry_count", text="")
         
         # Generate button
         layout.separator()
-        op = layout.operator("meshgen.generate_mesh", text="Generate Mesh")
-        op.prompt = scene.meshgen_prompt
-        op.resolution = scene.meshgen_resolution
-        op.format = scene.meshgen_format
-        op.retry_count = scene.meshgen_retry_count
+        layout.operator("meshgen.generate_mesh", text="Generate Mesh")
+        
+        # Batch generation
+        box = layout.box()
+        box.label(text="Batch Prompts (separate with ;):")
+        box.prop(props, "batch_prompts", text="")
+        box.operator("meshgen.batch_generate", text="Batch Generate")
 
 
 class MESHGEN_preferences(bpy.types.AddonPreferences):
@@ -249,6 +1006,7 @@ class MESHGEN_preferences(bpy.types.AddonPreferences):
         
         layout.prop(self, "api_key")
         layout.prop(self, "api_endpoint")
+        layout.operator("meshgen.clear_cache", icon='TRASH')
         
         layout.separator()
         layout.label(text="Note: You can also set the API key as an environment variable:")
@@ -256,14 +1014,16 @@ class MESHGEN_preferences(bpy.types.AddonPreferences):
 
 
 # Scene properties
-def register_properties():
-    bpy.types.Scene.meshgen_prompt = StringProperty(
+class MESHGEN_PG_properties(bpy.types.PropertyGroup):
+    """Generation settings shown in the panel"""
+    
+    prompt: StringProperty(
         name="Prompt",
         description="Natural language description of the desired mesh",
         default=""
     )
     
-    bpy.types.Scene.meshgen_resolution = EnumProperty(
+    resolution: EnumProperty(
         name="Resolution",
         description="Resolution of the generated mesh",
         items=[
@@ -274,7 +1034,7 @@ def register_properties():
         default='512'
     )
     
-    bpy.types.Scene.meshgen_format = EnumProperty(
+    format: EnumProperty(
         name="Format",
         description="Format of the mesh data",
         items=[
@@ -285,24 +1045,34 @@ def register_properties():
         default='json'
     )
     
-    bpy.types.Scene.meshgen_retry_count = IntProperty(
+    retry_count: IntProperty(
         name="Retry Count",
         description="Number of retries if API call fails",
         default=1,
         min=0,
         max=5
     )
+    
+    batch_prompts: StringProperty(
+        name="Batch Prompts",
+        description="Prompts for batch generation, separated by newlines or semicolons",
+        default=""
+    )
+
+
+def register_properties():
+    bpy.types.Scene.meshgen_props = PointerProperty(type=MESHGEN_PG_properties)
 
 
 def unregister_properties():
-    del bpy.types.Scene.meshgen_prompt
-    del bpy.types.Scene.meshgen_resolution
-    del bpy.types.Scene.meshgen_format
-    del bpy.types.Scene.meshgen_retry_count
+    del bpy.types.Scene.meshgen_props
 
 
 classes = (
+    MESHGEN_PG_properties,
     MESHGEN_OT_generate_mesh,
+    MESHGEN_OT_batch_generate,
+    MESHGEN_OT_clear_cache,
     MESHGEN_PT_panel,
     MESHGEN_preferences,
 )
@@ -318,6 +1088,9 @@ def unregister():
     unregister_properties()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
+    
+    # Release pooled connections
+    _SESSION.close()
 
 
 if __name__ == "__main__":